@@ -3,21 +3,287 @@ Local blockchain implementation for content registration and verification
 """
 import hashlib
 import json
+import multiprocessing
+import struct
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import rsa, padding, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
 from cryptography.exceptions import InvalidSignature
 from config.config import BLOCKCHAIN_FILE, GENESIS_BLOCK_HASH
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def sha256_hex(data: bytes) -> str:
+    """Return the hex SHA-256 digest of data"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_digest(data: bytes) -> bytes:
+    """Return the raw 32-byte SHA-256 digest of data"""
+    return hashlib.sha256(data).digest()
+
+
+# hashlib only releases the GIL for inputs of at least 2048 bytes, so threads only
+# pay off for batches of messages that size
+_GIL_RELEASE_BYTES = 2048
+_HASH_MANY_THREAD_MIN_COUNT = 64
+
+
+def hash_many(messages: List[bytes]) -> List[bytes]:
+    """
+    Raw SHA-256 digests of independent messages, in order.
+    Large batches of large messages are spread over a thread pool; otherwise a tight
+    sequential loop over hashlib is fastest.
+    """
+    workers = os.cpu_count() or 1
+    if (workers > 1 and len(messages) >= _HASH_MANY_THREAD_MIN_COUNT
+            and min(map(len, messages)) >= _GIL_RELEASE_BYTES):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(sha256_digest, messages))
+    return [hashlib.sha256(message).digest() for message in messages]
+
+
+def _to_bytes(value) -> bytes:
+    """
+    Normalize a hash/signature field to raw bytes.
+    Hex strings are decoded; non-hex legacy markers (e.g. 'GENESIS', '0') keep their UTF-8 bytes.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return value.encode('utf-8')
+
+
+def difficulty_target(difficulty: int) -> bytes:
+    """
+    Largest 32-byte digest with `difficulty` leading hex zeros.
+    Digests are big-endian, so `digest <= target` is the whole difficulty check.
+    """
+    return ((1 << (256 - 4 * difficulty)) - 1).to_bytes(32, 'big')
+
+
+def _dump_record(record: Dict) -> bytes:
+    """Serialize one ledger record as a newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, default=str) + '\n').encode('utf-8')
+
+
+def _load_record(data):
+    """Parse one JSON document from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Block hash formats: 0 is the original JSON encoding, kept so ledgers written
+# before the binary encoding still validate; every new block uses the latest
+LEGACY_HASH_VERSION = 0
+HASH_VERSION = 1
+
+# Fixed-width parts of the canonical block encoding used for hashing
+_HEADER = struct.Struct('>Qd')   # index, timestamp
+_LENGTH = struct.Struct('>I')    # length prefix for variable-size fields
+_NONCE = struct.Struct('>Q')     # always the trailing 8 bytes
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _find_nonce(header: bytes, target: bytes, start: int = 0, step: int = 1,
+                count: Optional[int] = None) -> int:
+    """
+    Scan nonces start, start + step, ... for one whose block hash meets target.
+    The header is absorbed once; each attempt copies that midstate and feeds
+    only the 8 nonce bytes. Returns -1 if `count` attempts find nothing.
+    """
+    midstate = hashlib.sha256(header)
+    nonce = start
+    attempts = 0
+    while count is None or attempts < count:
+        attempt = midstate.copy()
+        attempt.update(_NONCE.pack(nonce))
+        if attempt.digest() <= target:
+            return nonce
+        nonce += step
+        attempts += 1
+    return -1
+
+
+if NUMBA_AVAILABLE:
+    # SHA-256 round constants and initial hash value (FIPS 180-4)
+    _SHA256_K = np.array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+    ], dtype=np.int64)
+    _SHA256_H0 = np.array([
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+    ], dtype=np.int64)
+    
+    # 32-bit words are held in int64 and masked, which keeps Numba's integer
+    # typing simple and leaves headroom for the additions before each mask
+    @njit(cache=True)
+    def _rotr(x, n):
+        return ((x >> n) | (x << (32 - n))) & 0xFFFFFFFF
+    
+    @njit(cache=True)
+    def _sha256_compress(state, chunk, w):
+        """Apply one SHA-256 compression of a 64-byte chunk to state in place"""
+        for t in range(16):
+            w[t] = ((np.int64(chunk[4 * t]) << 24) | (np.int64(chunk[4 * t + 1]) << 16)
+                    | (np.int64(chunk[4 * t + 2]) << 8) | np.int64(chunk[4 * t + 3]))
+        for t in range(16, 64):
+            s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+            s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+            w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & 0xFFFFFFFF
+        
+        a, b, c, d = state[0], state[1], state[2], state[3]
+        e, f, g, h = state[4], state[5], state[6], state[7]
+        for t in range(64):
+            ch = (e & f) ^ ((e ^ 0xFFFFFFFF) & g)
+            temp1 = (h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + ch + _SHA256_K[t] + w[t]) & 0xFFFFFFFF
+            maj = (a & b) ^ (a & c) ^ (b & c)
+            temp2 = ((_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + maj) & 0xFFFFFFFF
+            h = g
+            g = f
+            f = e
+            e = (d + temp1) & 0xFFFFFFFF
+            d = c
+            c = b
+            b = a
+            a = (temp1 + temp2) & 0xFFFFFFFF
+        
+        state[0] = (state[0] + a) & 0xFFFFFFFF
+        state[1] = (state[1] + b) & 0xFFFFFFFF
+        state[2] = (state[2] + c) & 0xFFFFFFFF
+        state[3] = (state[3] + d) & 0xFFFFFFFF
+        state[4] = (state[4] + e) & 0xFFFFFFFF
+        state[5] = (state[5] + f) & 0xFFFFFFFF
+        state[6] = (state[6] + g) & 0xFFFFFFFF
+        state[7] = (state[7] + h) & 0xFFFFFFFF
+    
+    @njit(cache=True)
+    def _search_nonce_kernel(midstate, tail, nonce_offset, target_words, start, step, count):
+        """Compiled counterpart of _find_nonce operating on a prepared midstate and tail"""
+        w = np.empty(64, np.int64)
+        state = np.empty(8, np.int64)
+        nonce = start
+        for _ in range(count):
+            for k in range(8):
+                tail[nonce_offset + k] = (nonce >> (56 - 8 * k)) & 0xFF
+            state[:] = midstate
+            for offset in range(0, tail.shape[0], 64):
+                _sha256_compress(state, tail[offset:offset + 64], w)
+            
+            # Big-endian word-wise digest <= target
+            meets = True
+            for i in range(8):
+                if state[i] != target_words[i]:
+                    meets = state[i] < target_words[i]
+                    break
+            if meets:
+                return nonce
+            nonce += step
+        return -1
+    
+    def _prepare_kernel_inputs(header: bytes, target: bytes):
+        """Split header + nonce into a precomputed midstate and a padded tail to rehash"""
+        full = len(header) - len(header) % 64
+        midstate = _SHA256_H0.copy()
+        w = np.empty(64, np.int64)
+        prefix = np.frombuffer(header[:full], dtype=np.uint8)
+        for offset in range(0, full, 64):
+            _sha256_compress(midstate, prefix[offset:offset + 64], w)
+        
+        # Standard SHA-256 padding around the (zeroed) trailing nonce
+        message_bits = (len(header) + _NONCE.size) * 8
+        tail = header[full:] + bytes(_NONCE.size) + b'\x80'
+        tail += bytes(-(len(tail) + 8) % 64) + message_bits.to_bytes(8, 'big')
+        
+        target_words = np.array(struct.unpack('>8I', target), dtype=np.int64)
+        return midstate, np.frombuffer(tail, dtype=np.uint8).copy(), len(header) - full, target_words
+    
+    def _find_nonce_compiled(header: bytes, target: bytes, start: int = 0, step: int = 1,
+                             count: Optional[int] = None) -> int:
+        """Same contract as _find_nonce, run in the Numba kernel in fixed-size batches"""
+        midstate, tail, nonce_offset, target_words = _prepare_kernel_inputs(header, target)
+        batch = 1 << 20
+        nonce = start
+        remaining = count
+        while remaining is None or remaining > 0:
+            size = batch if remaining is None else min(batch, remaining)
+            found = _search_nonce_kernel(midstate, tail, nonce_offset, target_words, nonce, step, size)
+            if found >= 0:
+                return int(found)
+            nonce += size * step
+            if remaining is not None:
+                remaining -= size
+        return -1
+
+
+# Set in each proof-of-work worker process; raised by whichever worker wins
+_pow_stop_event = None
+
+
+def _init_pow_worker(stop_event):
+    global _pow_stop_event
+    _pow_stop_event = stop_event
+
+
+def _pow_worker(task) -> int:
+    """Scan one residue class of the nonce space until it or another worker finds a nonce"""
+    header, target, start, step, use_compiled = task
+    search = _find_nonce_compiled if use_compiled else _find_nonce
+    batch = 1 << 16
+    nonce = start
+    while not _pow_stop_event.is_set():
+        found = search(header, target, nonce, step, batch)
+        if found >= 0:
+            _pow_stop_event.set()
+            return found
+        nonce += batch * step
+    return -1
+
 
 class Block:
     """Represents a single block in the blockchain"""
     
-    def __init__(self, index: int, timestamp: float, content_hash: str, 
-                 creator_public_key: str, signature: str, previous_hash: str, nonce: int = 0):
+    # Fields covered by the block hash; assigning any of them drops the cached hash
+    _HASHED_FIELDS = frozenset(('index', 'timestamp', 'content_hash', 'creator_public_key',
+                                'signature', 'previous_hash', 'nonce', 'hash_version'))
+    # Held as raw bytes in memory; accepted as hex strings and written out as hex
+    _BYTES_FIELDS = frozenset(('content_hash', 'signature', 'previous_hash'))
+    
+    def __init__(self, index: int, timestamp: float, content_hash: Union[str, bytes], 
+                 creator_public_key: str, signature: Union[str, bytes],
+                 previous_hash: Union[str, bytes], nonce: int = 0,
+                 hash_version: int = HASH_VERSION):
+        self._digest = None
+        # Legacy blocks are hashed over their original field strings, which the
+        # bytes normalization can't reproduce ('0', 'GENESIS', upper-case hex)
+        self._text = {}
+        self.hash_version = hash_version
         self.index = index
         self.timestamp = timestamp
         self.content_hash = content_hash
@@ -28,20 +294,61 @@ class Block:
         
     def to_dict(self) -> Dict:
         """Convert block to dictionary representation"""
+        if self.hash_version == LEGACY_HASH_VERSION:
+            # Exactly the original record, which is also what the legacy hash covers
+            return {
+                'index': self.index,
+                'timestamp': self.timestamp,
+                'content_hash': self._text['content_hash'],
+                'creator_public_key': self.creator_public_key,
+                'signature': self._text['signature'],
+                'previous_hash': self._text['previous_hash'],
+                'nonce': self.nonce
+            }
         return {
             'index': self.index,
             'timestamp': self.timestamp,
-            'content_hash': self.content_hash,
+            'content_hash': self.content_hash.hex(),
             'creator_public_key': self.creator_public_key,
-            'signature': self.signature,
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce
+            'signature': self.signature.hex(),
+            'previous_hash': self.previous_hash.hex(),
+            'nonce': self.nonce,
+            'hash_version': self.hash_version
         }
     
+    def __setattr__(self, name, value):
+        if name in self._HASHED_FIELDS:
+            object.__setattr__(self, '_digest', None)
+            if name in self._BYTES_FIELDS:
+                if self.hash_version == LEGACY_HASH_VERSION:
+                    self._text[name] = value if isinstance(value, str) else bytes(value).hex()
+                value = _to_bytes(value)
+        object.__setattr__(self, name, value)
+    
+    def _header_bytes(self) -> bytes:
+        """Canonical binary encoding of every hashed field except the nonce"""
+        parts = [_HEADER.pack(self.index, self.timestamp)]
+        for data in (self.content_hash, self.creator_public_key.encode('utf-8'),
+                     self.signature, self.previous_hash):
+            parts.append(_LENGTH.pack(len(data)))
+            parts.append(data)
+        return b''.join(parts)
+    
+    def _hash_input(self) -> bytes:
+        """The exact bytes the block hash is computed over"""
+        if self.hash_version == LEGACY_HASH_VERSION:
+            return json.dumps(self.to_dict(), sort_keys=True, default=str).encode()
+        return self._header_bytes() + _NONCE.pack(self.nonce)
+    
+    def digest(self) -> bytes:
+        """Raw 32-byte block hash (memoized until a hashed field changes)"""
+        if self._digest is None:
+            self._digest = sha256_digest(self._hash_input())
+        return self._digest
+    
     def calculate_hash(self) -> str:
-        """Calculate the hash of the block"""
-        block_string = json.dumps(self.to_dict(), sort_keys=True, default=str)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        """Calculate the hash of the block as hex"""
+        return self.digest().hex()
 
 
 class Blockchain:
@@ -49,8 +356,15 @@ class Blockchain:
     
     def __init__(self, blockchain_file: str = None):
         self.chain = []
+        self._by_content_hash: Dict[bytes, Block] = {}
         self.blockchain_file = blockchain_file or str(BLOCKCHAIN_FILE)
+        self._legacy_file = False
         self.difficulty = 2  # Difficulty for proof of work
+        # Below this difficulty the one-off JIT compile costs more than it saves
+        self.compiled_pow_min_difficulty = 5
+        # Worker processes only pay for their startup on long searches
+        self.parallel_pow_min_difficulty = 6
+        self.pow_workers = os.cpu_count() or 1
         
         # Load existing blockchain or create genesis block
         self.load_blockchain()
@@ -62,13 +376,13 @@ class Blockchain:
         genesis_block = Block(
             index=0,
             timestamp=time.time(),
-            content_hash="0000000000000000000000000000000000000000000000000000000000000000",
+            content_hash=bytes(32),
             creator_public_key="GENESIS",
-            signature="GENESIS",
-            previous_hash="0"
+            signature=b"GENESIS",
+            previous_hash=bytes(32)
         )
         genesis_block.hash = genesis_block.calculate_hash()
-        self.chain.append(genesis_block)
+        self._append_block(genesis_block)
         self.save_blockchain()
     
     def add_block(self, content_hash: str, creator_public_key: str, signature: str) -> bool:
@@ -83,7 +397,7 @@ class Blockchain:
             content_hash=content_hash,
             creator_public_key=creator_public_key,
             signature=signature,
-            previous_hash=previous_block.calculate_hash()
+            previous_hash=previous_block.digest()
         )
         
         # Perform proof of work
@@ -91,22 +405,46 @@ class Blockchain:
         
         # Validate the block before adding
         if self.validate_block(new_block, previous_block):
-            self.chain.append(new_block)
-            self.save_blockchain()
+            self._append_block(new_block)
+            if self._legacy_file:
+                # A line can't be appended to a legacy document; convert it now
+                self.save_blockchain()
+            else:
+                self._write_block(new_block)
             return True
         return False
     
+    def _append_block(self, block: Block):
+        """Append a block and index it by content hash (earliest registration wins)"""
+        self.chain.append(block)
+        self._by_content_hash.setdefault(block.content_hash, block)
+    
     def proof_of_work(self, block: Block):
         """Simple proof of work algorithm"""
-        block.nonce = 0
-        computed_hash = block.calculate_hash()
+        header = block._header_bytes()
+        target = difficulty_target(self.difficulty)
         
-        # Adjust difficulty by checking leading zeros
-        while not computed_hash.startswith('0' * self.difficulty):
-            block.nonce += 1
-            computed_hash = block.calculate_hash()
+        use_compiled = NUMBA_AVAILABLE and self.difficulty >= self.compiled_pow_min_difficulty
+        if self.pow_workers > 1 and self.difficulty >= self.parallel_pow_min_difficulty:
+            nonce = self._parallel_find_nonce(header, target, use_compiled)
+        elif use_compiled:
+            nonce = _find_nonce_compiled(header, target)
+        else:
+            nonce = _find_nonce(header, target)
         
-        block.hash = computed_hash
+        block.nonce = nonce
+        block.hash = block.calculate_hash()
+    
+    def _parallel_find_nonce(self, header: bytes, target: bytes, use_compiled: bool) -> int:
+        """Search disjoint nonce residues mod pow_workers in parallel; first hit wins"""
+        workers = self.pow_workers
+        stop_event = multiprocessing.Event()
+        tasks = [(header, target, k, workers, use_compiled) for k in range(workers)]
+        with multiprocessing.Pool(workers, initializer=_init_pow_worker, initargs=(stop_event,)) as pool:
+            for found in pool.imap_unordered(_pow_worker, tasks):
+                if found >= 0:
+                    return found
+        raise RuntimeError("Proof of work ended without a valid nonce")
     
     def validate_block(self, new_block: Block, previous_block: Block) -> bool:
         """Validate a block before adding to chain"""
@@ -115,7 +453,7 @@ class Blockchain:
             return False
         
         # Check previous hash
-        if previous_block.calculate_hash() != new_block.previous_hash:
+        if previous_block.digest() != new_block.previous_hash:
             return False
         
         # Check proof of work
@@ -132,33 +470,42 @@ class Blockchain:
         if len(self.chain) == 0:
             return True
         
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
+        # Single walk: each block's hash is carried forward as the expected
+        # previous_hash of the next block
+        pow_prefix = '0' * self.difficulty
+        previous_block = self.chain[0]
+        previous_digest = previous_block.digest()
+        
+        for current_block in self.chain[1:]:
+            current_digest = current_block.digest()
+            current_hash = current_digest.hex()
             
-            # Check if the current block is valid
-            if not self.validate_block(current_block, previous_block):
+            if (current_block.index != previous_block.index + 1
+                    or current_block.previous_hash != previous_digest
+                    or not current_hash.startswith(pow_prefix)
+                    or current_hash != current_block.hash):
                 return False
             
-            # Check if the stored hash matches calculated hash
-            if current_block.calculate_hash() != current_block.hash:
-                return False
+            previous_block = current_block
+            previous_digest = current_digest
         
         return True
     
-    def get_content_registration(self, content_hash: str) -> Optional[Dict]:
+    def get_content_registration(self, content_hash: Union[str, bytes]) -> Optional[Dict]:
         """Find the registration record for a given content hash"""
-        for block in self.chain:
-            if block.content_hash == content_hash:
-                return {
-                    'index': block.index,
-                    'timestamp': block.timestamp,
-                    'content_hash': block.content_hash,
-                    'creator_public_key': block.creator_public_key,
-                    'signature': block.signature,
-                    'block_hash': block.calculate_hash()
-                }
-        return None
+        block = self._by_content_hash.get(_to_bytes(content_hash))
+        if block is None:
+            return None
+        # The stored record's strings: legacy blocks keep theirs exactly as registered
+        record = block.to_dict()
+        return {
+            'index': block.index,
+            'timestamp': block.timestamp,
+            'content_hash': record['content_hash'],
+            'creator_public_key': block.creator_public_key,
+            'signature': record['signature'],
+            'block_hash': block.calculate_hash()
+        }
     
     def get_verification_report(self, content_hash: str) -> Dict:
         """Generate a verification report for a given content hash"""
@@ -185,17 +532,36 @@ class Blockchain:
             }
     
     def save_blockchain(self):
-        """Save the blockchain to file"""
+        """
+        Rewrite the whole ledger file (compaction).
+        The ledger holds one JSON block record per line; appends go through _write_block.
+        """
         os.makedirs(os.path.dirname(self.blockchain_file), exist_ok=True)
         
-        blockchain_data = {
-            'chain': [block.to_dict() for block in self.chain],
-            'length': len(self.chain),
-            'valid': self.is_valid_chain()
-        }
-        
-        with open(self.blockchain_file, 'w') as f:
-            json.dump(blockchain_data, f, indent=2, default=str)
+        temp_file = self.blockchain_file + '.tmp'
+        with open(temp_file, 'wb') as f:
+            f.write(b''.join(_dump_record(block.to_dict()) for block in self.chain))
+        os.replace(temp_file, self.blockchain_file)
+        self._legacy_file = False
+    
+    def _load_block(self, record: Dict) -> Block:
+        """Rebuild a block from a ledger record (not hashed yet)"""
+        # Records written before hash versioning carry no version and use the JSON hash
+        record.setdefault('hash_version', LEGACY_HASH_VERSION)
+        return Block(**record)
+    
+    def _append_loaded(self, blocks: List[Block]):
+        """Hash freshly loaded blocks in one batch and append them"""
+        digests = hash_many([block._hash_input() for block in blocks])
+        for block, block_digest in zip(blocks, digests):
+            block._digest = block_digest
+            block.hash = block_digest.hex()
+            self._append_block(block)
+    
+    def _write_block(self, block: Block):
+        """Append a single block record to the ledger file"""
+        with open(self.blockchain_file, 'ab') as f:
+            f.write(_dump_record(block.to_dict()))
     
     def load_blockchain(self):
         """Load the blockchain from file"""
@@ -203,35 +569,67 @@ class Blockchain:
             return
         
         try:
-            with open(self.blockchain_file, 'r') as f:
-                blockchain_data = json.load(f)
-                
             self.chain = []
-            for block_data in blockchain_data['chain']:
-                block = Block(
-                    index=block_data['index'],
-                    timestamp=block_data['timestamp'],
-                    content_hash=block_data['content_hash'],
-                    creator_public_key=block_data['creator_public_key'],
-                    signature=block_data['signature'],
-                    previous_hash=block_data['previous_hash'],
-                    nonce=block_data.get('nonce', 0)
-                )
-                block.hash = block.calculate_hash()
-                self.chain.append(block)
+            self._by_content_hash = {}
+            needs_compaction = False
+            
+            with open(self.blockchain_file, 'rb') as f:
+                # Ledgers written before the append-only format are one indented document
+                self._legacy_file = f.readline().strip() == b'{'
+                f.seek(0)
+                if self._legacy_file:
+                    self._append_loaded([self._load_block(record)
+                                         for record in _load_record(f.read())['chain']])
+                    # Only convert a ledger that checks out; otherwise leave the
+                    # original document untouched until the next write
+                    needs_compaction = self.is_valid_chain()
+                else:
+                    # One record per line, parsed as it streams; hashing waits for the batch
+                    blocks = []
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            # Final line without its newline: keep it if the record
+                            # is complete, drop it if the append was torn
+                            needs_compaction = True
+                            try:
+                                record = _load_record(line)
+                            except ValueError:
+                                break
+                        elif not line.strip():
+                            continue
+                        else:
+                            record = _load_record(line)
+                        blocks.append(self._load_block(record))
+                    self._append_loaded(blocks)
+            
+            if needs_compaction and self.chain:
+                self.save_blockchain()
         except Exception as e:
             print(f"Error loading blockchain: {str(e)}")
             self.chain = []
+            self._by_content_hash = {}
 
 
 # Utility functions for signing and verification
+
+# Stateless cryptography parameter objects, shared by every sign/verify call
+_PKCS1 = padding.PKCS1v15()
+_SHA256 = hashes.SHA256()
+_PREHASHED_SHA256 = Prehashed(_SHA256)
+
+
 def sign_content(content_hash: str, private_key) -> str:
-    """Sign a content hash with a private key"""
+    """Sign a content hash with a private key (RSA or Ed25519)"""
+    # Ed25519 signs the message bytes (RFC 8032). RSA gets a hashlib digest signed
+    # prehashed, identical to signing the message with SHA-256 directly.
     message = content_hash.encode('utf-8')
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(message).hex()
+    digest = hashlib.sha256(message).digest()
     signature = private_key.sign(
-        message,
-        padding.PKCS1v15(),
-        hashes.SHA256()
+        digest,
+        _PKCS1,
+        _PREHASHED_SHA256
     )
     return signature.hex()
 
@@ -241,15 +639,15 @@ def verify_signature(content_hash: str, signature_hex: str, public_key) -> bool:
     try:
         signature = bytes.fromhex(signature_hex)
         message = content_hash.encode('utf-8')
-        public_key.verify(
-            signature,
-            message,
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        )
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, message)
+        else:
+            public_key.verify(
+                signature,
+                hashlib.sha256(message).digest(),
+                _PKCS1,
+                _PREHASHED_SHA256
+            )
         return True
     except InvalidSignature:
         return False
-
-
-
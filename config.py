@@ -16,6 +16,7 @@ CACHE_DIR = DATA_DIR / "cache"
 
 # Model paths
 MODELS_DIR = BASE_DIR / "models"
+FACE_DETECTION_MODEL = MODELS_DIR / "face_detection_yunet_2023mar.onnx"  # Optional; Haar cascade used if absent
 
 # Blockchain configuration
 BLOCKCHAIN_FILE = BLOCKCHAIN_DIR / "ledger.json"
@@ -6,11 +6,51 @@ import numpy as np
 import cv2
 from PIL import Image
 import pywt
-from scipy import stats
-from typing import Dict, Any, Tuple
+from scipy import fft, stats
+from typing import Dict, Any, Optional, Tuple
+from utils.parallel import run_detectors
 import warnings
 warnings.filterwarnings('ignore')
 
+# db4 decomposition filters, reversed so cv2's correlation performs pywt's convolution
+_DB4 = pywt.Wavelet('db4')
+_DB4_LO = np.asarray(_DB4.dec_lo[::-1], dtype=np.float32)
+_DB4_HI = np.asarray(_DB4.dec_hi[::-1], dtype=np.float32)
+_DB4_PAD = _DB4.dec_len - 1
+
+
+def _db4_details(channel: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Single-level db4 detail subbands (cH, cV, cD), matching pywt.dwt2 in
+    'symmetric' mode, via separable cv2 filtering and 2x decimation.
+    The approximation band is never used by the detector, so it is skipped.
+    """
+    height, width = channel.shape[:2]
+    out_h = (height + _DB4_PAD) // 2
+    out_w = (width + _DB4_PAD) // 2
+    padded = cv2.copyMakeBorder(channel, _DB4_PAD, _DB4_PAD, _DB4_PAD, _DB4_PAD,
+                                cv2.BORDER_REFLECT)
+    
+    def subband(kernel_x, kernel_y):
+        filtered = cv2.sepFilter2D(padded, cv2.CV_32F, kernel_x, kernel_y,
+                                   anchor=(0, 0), borderType=cv2.BORDER_CONSTANT)
+        return filtered[1:2 * out_h:2, 1:2 * out_w:2]
+    
+    return (subband(_DB4_LO, _DB4_HI),
+            subband(_DB4_HI, _DB4_LO),
+            subband(_DB4_HI, _DB4_HI))
+
+
+def _pearson(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Pearson correlation of two equally shaped arrays, computed on the arrays
+    as given (views are fine) instead of np.corrcoef's flattened copies and 2x2 matrix
+    """
+    a_mean = a.mean(dtype=np.float64)
+    b_mean = b.mean(dtype=np.float64)
+    covariance = np.mean(a * b, dtype=np.float64) - a_mean * b_mean
+    return float(covariance / (a.std(dtype=np.float64) * b.std(dtype=np.float64) + 1e-12))
+
 
 class AIGenerationDetector:
     """Multi-signal detector for AI-generated content"""
@@ -21,19 +61,23 @@ class AIGenerationDetector:
         self.artifact_threshold = 0.6
         self.inconsistency_threshold = 0.7
     
-    def detect_frequency_artifacts(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_frequency_artifacts(self, image_path: str, *,
+                                   gray: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect frequency domain artifacts typical in AI-generated images
         Uses FFT to identify unnatural frequency patterns
         """
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        img = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         if img is None:
             return 0.0, {"error": "Could not load image"}
         
-        # Apply FFT
-        f_transform = np.fft.fft2(img)
-        f_shift = np.fft.fftshift(f_transform)
-        magnitude_spectrum = np.log(np.abs(f_shift) + 1)
+        # Apply FFT. The spectrum of a real image is Hermitian, so the half plane from
+        # rfft2 carries the same magnitude statistics; fftshift only reorders bins.
+        # float32 input keeps the transform in complex64 and the spectrum in float32.
+        f_transform = fft.rfft2(img.astype(np.float32), workers=-1)
+        magnitude_spectrum = np.abs(f_transform)
+        magnitude_spectrum += 1
+        np.log(magnitude_spectrum, out=magnitude_spectrum)
         
         # Look for grid-like patterns or unnatural regularities in frequency domain
         # AI-generated images often have unnatural frequency distributions
@@ -57,24 +101,25 @@ class AIGenerationDetector:
         
         return confidence, details
     
-    def detect_noise_residual_patterns(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_noise_residual_patterns(self, image_path: str, *,
+                                       img: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Analyze noise residual patterns that differ between real and AI-generated images
         """
-        img = cv2.imread(image_path)
+        if img is None:
+            img = cv2.imread(image_path)
         if img is None:
             return 0.0, {"error": "Could not load image"}
         
-        # Convert to float and normalize
-        img_float = img.astype(np.float32) / 255.0
-        
-        # Apply JPEG compression simulation to extract residuals
+        # Apply JPEG compression simulation to extract residuals. The in-memory
+        # libjpeg round trip takes the decoded uint8 pixels as they are.
         encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 95]
-        _, img_jpeg = cv2.imencode('.jpg', (img_float * 255).astype(np.uint8), encode_param)
-        img_decoded = cv2.imdecode(img_jpeg, cv2.IMREAD_COLOR).astype(np.float32) / 255.0
+        _, img_jpeg = cv2.imencode('.jpg', img, encode_param)
+        img_decoded = cv2.imdecode(img_jpeg, cv2.IMREAD_COLOR)
         
-        # Calculate residual (difference between original and compressed)
-        residual = img_float - img_decoded
+        # Calculate residual (difference between original and compressed), normalized to 0..1
+        residual = cv2.subtract(img, img_decoded, dtype=cv2.CV_32F)
+        residual *= 1.0 / 255.0
         
         # AI-generated images often have very uniform or structured residuals
         residual_std = np.std(residual)
@@ -83,8 +128,8 @@ class AIGenerationDetector:
         # Analyze spatial correlation in residuals
         # Real images typically have more random residual patterns
         # AI images often have structured residuals
-        corr_x = np.corrcoef(residual[:, :-1].flatten(), residual[:, 1:].flatten())[0, 1]
-        corr_y = np.corrcoef(residual[:-1, :].flatten(), residual[1:, :].flatten())[0, 1]
+        corr_x = _pearson(residual[:, :-1], residual[:, 1:])
+        corr_y = _pearson(residual[:-1, :], residual[1:, :])
         
         # High correlation in residuals suggests artificial origin
         correlation_score = (abs(corr_x) + abs(corr_y)) / 2
@@ -101,11 +146,13 @@ class AIGenerationDetector:
         
         return confidence, details
     
-    def detect_gan_fingerprints(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_gan_fingerprints(self, image_path: str, *,
+                                img: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect GAN-specific fingerprints and artifacts
         """
-        img = cv2.imread(image_path)
+        if img is None:
+            img = cv2.imread(image_path)
         if img is None:
             return 0.0, {"error": "Could not load image"}
         
@@ -114,8 +161,7 @@ class AIGenerationDetector:
         y_channel = img_yuv[:,:,0].astype(np.float32)
         
         # Analyze wavelet coefficients for GAN artifacts
-        coeffs = pywt.dwt2(y_channel, 'db4')
-        cA, (cH, cV, cD) = coeffs
+        cH, cV, cD = _db4_details(y_channel)
         
         # GAN images often show unusual patterns in wavelet coefficients
         # Calculate statistics on detail coefficients
@@ -125,12 +171,15 @@ class AIGenerationDetector:
         
         # Calculate entropy of coefficients (AI images often have lower entropy)
         def calculate_entropy(coeffs):
-            # Flatten and create histogram
-            flat_coeffs = coeffs.flatten()
-            hist, _ = np.histogram(flat_coeffs, bins=256)
+            # Quantize into the same 256 equal-width bins np.histogram would use,
+            # then count with bincount instead of histogram's sort/searchsorted
+            c_min = coeffs.min()
+            scale = np.float32(256.0 / (coeffs.max() - c_min + 1e-9))
+            bins = np.minimum((coeffs - c_min) * scale, np.float32(255)).astype(np.uint8)
+            hist = np.bincount(bins.ravel(), minlength=256)
             hist = hist[hist > 0]  # Remove zero values
-            prob = hist / np.sum(hist)
-            entropy = -np.sum(prob * np.log2(prob + 1e-10))
+            prob = hist / hist.sum()
+            entropy = -np.sum(prob * np.log2(prob))
             return entropy
         
         h_entropy = calculate_entropy(cH)
@@ -160,11 +209,13 @@ class AIGenerationDetector:
         
         return confidence, details
     
-    def detect_diffusion_artifacts(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_diffusion_artifacts(self, image_path: str, *,
+                                   img: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect artifacts specific to diffusion models
         """
-        img = cv2.imread(image_path)
+        if img is None:
+            img = cv2.imread(image_path)
         if img is None:
             return 0.0, {"error": "Could not load image"}
         
@@ -175,16 +226,17 @@ class AIGenerationDetector:
         # Look for characteristic patterns in lightness channel
         # Diffusion models sometimes show subtle periodic patterns
         
-        # Calculate local variance in small patches
+        # Calculate local variance in small patches, all at once: tile the patch grid
+        # (same grid as range(0, size - patch_size, patch_size)) into one row per patch
         patch_size = 8
         height, width = l_channel.shape
-        variances = []
-        
-        for i in range(0, height - patch_size, patch_size):
-            for j in range(0, width - patch_size, patch_size):
-                patch = l_channel[i:i+patch_size, j:j+patch_size]
-                patch_var = np.var(patch)
-                variances.append(patch_var)
+        rows = max(0, (height - 1) // patch_size)
+        cols = max(0, (width - 1) // patch_size)
+        patches = (l_channel[:rows * patch_size, :cols * patch_size]
+                   .reshape(rows, patch_size, cols, patch_size)
+                   .swapaxes(1, 2)
+                   .reshape(rows * cols, patch_size * patch_size))
+        variances = patches.var(axis=1)
         
         # Calculate statistics of patch variances
         var_mean = np.mean(variances)
@@ -278,11 +330,20 @@ class AIGenerationDetector:
         if content_type == 'image':
             image_path = content_data['file_path']
             
+            # Decode once and share the arrays with every detector
+            img = cv2.imread(image_path)
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img is not None else None
+            
             # Run all detection methods
-            freq_conf, freq_details = self.detect_frequency_artifacts(image_path)
-            noise_conf, noise_details = self.detect_noise_residual_patterns(image_path)
-            gan_conf, gan_details = self.detect_gan_fingerprints(image_path)
-            diff_conf, diff_details = self.detect_diffusion_artifacts(image_path)
+            detectors = [
+                (self.detect_frequency_artifacts, {'gray': gray}),
+                (self.detect_noise_residual_patterns, {'img': img}),
+                (self.detect_gan_fingerprints, {'img': img}),
+                (self.detect_diffusion_artifacts, {'img': img})
+            ]
+            outputs = run_detectors(image_path, detectors)
+            (freq_conf, freq_details), (noise_conf, noise_details), \
+                (gan_conf, gan_details), (diff_conf, diff_details) = outputs
             
             # Store individual results
             results['detection_signals'] = {
@@ -4,12 +4,26 @@ Main entry point for the AI Content Authenticity Verification System
 import argparse
 import sys
 import os
-from verification_engine.verifier import VerificationEngine
-from identity.identity_manager import IdentityManager
-from blockchain.blockchain import Blockchain
-from utils.security import SecurityMeasures, ThreatModel
 import json
 
+# Subsystems (crypto, numpy/OpenCV, Flask) are imported inside the commands that
+# use them, so informational commands and --help start without loading them.
+
+# Verification results keyed by file SHA-256, so identical content is analyzed once
+_verification_results = {}
+
+# Process-wide VerificationEngine; its detectors and models are loaded once
+_engine = None
+
+
+def _get_engine():
+    """Return the shared VerificationEngine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        from verification_engine.verifier import VerificationEngine
+        _engine = VerificationEngine()
+    return _engine
+
 
 def print_system_info():
     """Print system information and capabilities"""
@@ -32,8 +46,12 @@ def test_system():
     """Test the complete system with sample operations"""
     print("\nTesting System Components...\n")
     
+    from identity.identity_manager import IdentityManager
+    from blockchain.blockchain import Blockchain
+    from utils.security import SecurityMeasures, ThreatModel
+    
     # Initialize system components
-    verifier = VerificationEngine()
+    verifier = _get_engine()
     identity_manager = IdentityManager()
     blockchain = Blockchain()
     security = SecurityMeasures()
@@ -69,7 +87,7 @@ def test_system():
     print("\nSystem test completed successfully!")
 
 
-def run_web_server():
+def run_web_server(dev=False):
     """Start the web interface"""
     from ui.app import app
     print("\nStarting web server...")
@@ -77,7 +95,19 @@ def run_web_server():
     print("Press Ctrl+C to stop the server\n")
     
     try:
-        app.run(debug=True, host='127.0.0.1', port=5000)
+        if dev:
+            # Flask's debug server with the reloader, for development
+            app.run(debug=True, host='127.0.0.1', port=5000)
+            return
+        
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress not installed; using Flask's threaded server")
+            app.run(debug=False, threaded=True, host='127.0.0.1', port=5000)
+        else:
+            # Thread pool so concurrent verification requests overlap
+            serve(app, host='127.0.0.1', port=5000, threads=(os.cpu_count() or 1) * 2)
     except KeyboardInterrupt:
         print("\nWeb server stopped.")
 
@@ -91,7 +121,7 @@ def verify_single_file(file_path):
     print(f"Verifying file: {file_path}")
     
     try:
-        verifier = VerificationEngine()
+        verifier = _get_engine()
         result = verifier.verify_content(file_path)
         
         print("\nVerification Result:")
@@ -119,6 +149,62 @@ def verify_single_file(file_path):
         print(f"Error verifying file: {e}")
 
 
+def verify_batch(file_paths):
+    """Verify several files in parallel with one shared verification engine"""
+    from concurrent.futures import ThreadPoolExecutor
+    from identity.identity_manager import sha256_file
+    
+    existing = []
+    for file_path in file_paths:
+        if os.path.isfile(file_path):
+            existing.append(file_path)
+        elif os.path.exists(file_path):
+            print(f"Error: Not a file: {file_path}")
+        else:
+            print(f"Error: File does not exist: {file_path}")
+    if not existing:
+        return
+    
+    print(f"Verifying {len(existing)} files...")
+    
+    def hash_file(file_path):
+        # An unreadable file is reported and skipped; it must not abort the batch
+        try:
+            return sha256_file(file_path), None
+        except OSError as e:
+            return None, e
+    
+    verifier = _get_engine()
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        hashed = []
+        for file_path, (content_hash, error) in zip(existing, executor.map(hash_file, existing)):
+            if error is not None:
+                print(f"{file_path}: Error reading file: {error}")
+            else:
+                hashed.append((file_path, content_hash))
+        
+        # Submit each distinct, not yet verified content once
+        pending = {}
+        for file_path, content_hash in hashed:
+            if content_hash not in _verification_results and content_hash not in pending:
+                pending[content_hash] = executor.submit(verifier.verify_content, file_path)
+        
+        print("\nBatch Verification Results:")
+        print("=" * 40)
+        for file_path, content_hash in hashed:
+            try:
+                if content_hash not in _verification_results:
+                    _verification_results[content_hash] = pending[content_hash].result()
+                result = _verification_results[content_hash]
+            except Exception as e:
+                print(f"{file_path}: Error verifying file: {e}")
+                continue
+            
+            print(f"{file_path}: {result['final_assessment']['authenticity_level']} "
+                  f"(confidence {result['overall_confidence']:.2f}, "
+                  f"blockchain {result['blockchain_verification']['status']})")
+
+
 def register_content(file_path, identity_name):
     """Register content in the blockchain"""
     if not os.path.exists(file_path):
@@ -128,7 +214,8 @@ def register_content(file_path, identity_name):
     print(f"Registering content: {file_path}")
     
     try:
-        verifier = VerificationEngine()
+        from identity.identity_manager import IdentityManager
+        verifier = _get_engine()
         identity_manager = IdentityManager()
         
         # Load or create identity
@@ -248,7 +335,11 @@ def main():
     parser = argparse.ArgumentParser(description='AI Content Authenticity Verification System')
     parser.add_argument('--test', action='store_true', help='Run system tests')
     parser.add_argument('--web', action='store_true', help='Start web server')
+    parser.add_argument('--dev', action='store_true',
+                       help='With --web, use the Flask debug server instead of waitress')
     parser.add_argument('--verify', type=str, help='Verify a single file')
+    parser.add_argument('--verify-batch', nargs='+', metavar='FILE',
+                       help='Verify several files in parallel')
     parser.add_argument('--register', nargs=2, metavar=('FILE', 'IDENTITY'), 
                        help='Register content with identity')
     parser.add_argument('--show-limitations', action='store_true', 
@@ -263,9 +354,11 @@ def main():
     if args.test:
         test_system()
     elif args.web:
-        run_web_server()
+        run_web_server(dev=args.dev)
     elif args.verify:
         verify_single_file(args.verify)
+    elif args.verify_batch:
+        verify_batch(args.verify_batch)
     elif args.register:
         register_content(args.register[0], args.register[1])
     elif args.show_limitations:
@@ -278,6 +371,7 @@ def main():
         print("  python main.py --test                    # Run system tests")
         print("  python main.py --web                     # Start web server")
         print("  python main.py --verify path/to/file     # Verify a file")
+        print("  python main.py --verify-batch a.jpg b.png  # Verify several files")
         print("  python main.py --register path/to/file identity_name  # Register content")
         print("  python main.py --show-limitations        # Show system limitations")
         print("  python main.py --show-upgrades          # Show upgrade path")
@@ -4,32 +4,214 @@ Manages cryptographic identities for content creators
 """
 import os
 import json
+import atexit
+import threading
+import time
+import weakref
 import base64
-from typing import Dict, Any, Tuple, Optional
+import hashlib
+import mmap
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import rsa, padding, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+from cryptography.exceptions import InvalidSignature, InvalidTag
 from config.config import KEY_SIZE
 import secrets
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Messages are digested with hashlib (OpenSSL, SHA extensions when the CPU has them) and
+# RSA is given the digest as prehashed SHA-256, which yields the standard PKCS#1 v1.5
+# signature. Ed25519 signs the message bytes themselves (RFC 8032); its SHA-256 digest
+# only keys the verification cache. sign_file is the one exception, see its docstring.
+_PKCS1 = padding.PKCS1v15()
+_PREHASHED_SHA256 = Prehashed(hashes.SHA256())
+_FILE_CHUNK_SIZE = 4 << 20  # 4 MiB slices for the mmap fallback
+_FINGERPRINT_PREFIX_LEN = 8  # short-ID length indexed by CreatorRegistry
+
+SIGNATURE_SCHEME_ED25519 = 'ed25519'
+SIGNATURE_SCHEME_RSA = 'rsa'  # identities created before signature_scheme was recorded
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode obj as newline-terminated JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return (json.dumps(obj, indent=2 if indent else None) + '\n').encode('utf-8')
+
+
+def _loads(data) -> Any:
+    """Decode JSON from bytes, memoryview or str (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write data to a temporary file and swap it in, so a crash never leaves a torn file"""
+    temp_file = path + '.tmp'
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+    os.replace(temp_file, path)
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO-8601 string with microseconds and a 'Z' suffix"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _sha256_file_digest(path: str) -> bytes:
+    """Raw SHA-256 digest of a file's contents, without reading it into memory whole"""
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashed in C straight from the file descriptor
+            return hashlib.file_digest(f, 'sha256').digest()
+        
+        hasher = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(view), _FILE_CHUNK_SIZE):
+                        hasher.update(view[offset:offset + _FILE_CHUNK_SIZE])
+                finally:
+                    view.release()
+        return hasher.digest()
+
+
+def sha256_file(path: str) -> str:
+    """Hex SHA-256 digest of a file's contents"""
+    return _sha256_file_digest(path).hex()
+
+
+def _sign_digest(private_key, msg_digest: bytes) -> bytes:
+    """Sign a SHA-256 digest: prehashed for RSA, the 32 digest bytes as the message for Ed25519"""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(msg_digest)
+    return private_key.sign(msg_digest, _PKCS1, _PREHASHED_SHA256)
+
+
+def _sign_message(private_key, message: bytes) -> bytes:
+    """Sign message bytes with an Ed25519 or RSA private key (standard signatures for both)"""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(message)
+    return private_key.sign(hashlib.sha256(message).digest(), _PKCS1, _PREHASHED_SHA256)
+
+
+@lru_cache(maxsize=256)
+def _load_private_key(private_key_pem: bytes):
+    """Parse an unencrypted PEM private key once per distinct key"""
+    return serialization.load_pem_private_key(private_key_pem, password=None)
+
+
+@lru_cache(maxsize=256)
+def _load_public_key(public_key_pem: bytes):
+    """Parse a PEM public key once per distinct key"""
+    return serialization.load_pem_public_key(public_key_pem)
+
+
+# Verification results by (public key PEM, message SHA-256, signature), least recently used first
+_VERIFY_CACHE_SIZE = 4096
+_verify_results: 'OrderedDict[Tuple[bytes, bytes, bytes], bool]' = OrderedDict()
+_verify_lock = threading.Lock()
+
+
+def _verify_cached(public_key_pem: bytes, message: bytes, signature: bytes) -> bool:
+    """
+    Verify a signature over message bytes
+    Verification is a pure function of its inputs, so repeat checks are a cache hit;
+    the cache is keyed by the message digest rather than the message itself
+    """
+    msg_digest = hashlib.sha256(message).digest()
+    key = (public_key_pem, msg_digest, signature)
+    with _verify_lock:
+        result = _verify_results.get(key)
+        if result is not None:
+            _verify_results.move_to_end(key)
+            return result
+    
+    public_key = _load_public_key(public_key_pem)
+    try:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, message)
+        else:
+            public_key.verify(signature, msg_digest, _PKCS1, _PREHASHED_SHA256)
+        result = True
+    except InvalidSignature:
+        result = False
+    
+    with _verify_lock:
+        _verify_results[key] = result
+        if len(_verify_results) > _VERIFY_CACHE_SIZE:
+            _verify_results.popitem(last=False)
+    return result
+
+
+@lru_cache(maxsize=32)
+def _derive_storage_key(passphrase: bytes, salt: bytes) -> bytes:
+    """
+    Derive the 256-bit key that seals private keys at rest (scrypt, N=2**14)
+    Cached per (passphrase, salt), so a session pays the KDF once, not once per identity
+    """
+    return Scrypt(salt=salt, length=32, n=2 ** 14, r=8, p=1).derive(passphrase)
+
+
+def clear_verification_cache():
+    """Drop cached keys and verification results (e.g. between tests)"""
+    _derive_storage_key.cache_clear()
+    with _verify_lock:
+        _verify_results.clear()
+    _load_private_key.cache_clear()
+    _load_public_key.cache_clear()
 
 
 class IdentityManager:
     """Manages cryptographic identities for content creators"""
     
-    def __init__(self, keys_dir: str = "keys"):
+    def __init__(self, keys_dir: str = "keys", passphrase: Optional[str] = None):
         self.keys_dir = keys_dir
         os.makedirs(keys_dir, exist_ok=True)
+        
+        # With a passphrase, private keys are sealed with ChaCha20-Poly1305 on save.
+        # One salt per manager keeps every identity it writes on the same derived key.
+        self._passphrase = passphrase.encode('utf-8') if passphrase is not None else None
+        self._kdf_salt = secrets.token_bytes(16)
+        
+        # Parsed identities by file path, reused while the file's mtime is unchanged
+        self._identity_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
     
-    def generate_identity(self) -> Dict[str, Any]:
+    def generate_identity(self, signature_scheme: str = SIGNATURE_SCHEME_ED25519) -> Dict[str, Any]:
         """
         Generate a new cryptographic identity with public/private key pair
         Returns a dictionary containing both keys
         """
-        # Generate RSA key pair
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=KEY_SIZE,
-        )
+        if signature_scheme == SIGNATURE_SCHEME_ED25519:
+            # Ed25519: sub-millisecond keygen, 64-byte signatures
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        elif signature_scheme == SIGNATURE_SCHEME_RSA:
+            private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=KEY_SIZE,
+            )
+        else:
+            raise ValueError(f"Unsupported signature scheme: {signature_scheme}")
         public_key = private_key.public_key()
         
         # Serialize private key (encrypted with a password)
@@ -44,29 +226,133 @@ class IdentityManager:
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
+        # DER is serialized once: stored for consumers and hashed for the fingerprint
+        public_der = public_key.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
         
         # Create identity
         identity = {
             'private_key': private_pem.decode('utf-8'),
             'public_key': public_pem.decode('utf-8'),
-            'public_key_fingerprint': self._calculate_public_key_fingerprint(public_key),
+            'public_key_der_b64': base64.b64encode(public_der).decode('ascii'),
+            'public_key_fingerprint': hashlib.sha256(public_der).hexdigest(),
+            'signature_scheme': signature_scheme,
             'created_at': self._get_timestamp()
         }
         
         return identity
     
     def save_identity(self, identity: Dict[str, Any], filename: str) -> str:
-        """Save identity to a file"""
-        filepath = os.path.join(self.keys_dir, f"{filename}.json")
-        with open(filepath, 'w') as f:
-            json.dump(identity, f, indent=2)
+        """Save identity to a file (private key sealed when a passphrase is set)"""
+        if self._passphrase is not None and 'private_key' in identity:
+            identity = self._seal_private_key(identity)
+        
+        # Compact binary msgpack when available, indented JSON otherwise
+        if msgpack is not None:
+            filepath = os.path.join(self.keys_dir, f"{filename}.msgpack")
+            data = msgpack.packb(identity, use_bin_type=True)
+        else:
+            filepath = os.path.join(self.keys_dir, f"{filename}.json")
+            data = _dumps(identity)
+        
+        _write_atomic(filepath, data)
         return filepath
     
     def load_identity(self, filename: str) -> Dict[str, Any]:
-        """Load identity from a file"""
-        filepath = os.path.join(self.keys_dir, f"{filename}.json")
-        with open(filepath, 'r') as f:
-            identity = json.load(f)
+        """Load identity from a file (.msgpack preferred, .json for older identities)"""
+        msgpack_path = os.path.join(self.keys_dir, f"{filename}.msgpack")
+        if os.path.exists(msgpack_path):
+            return self._read_identity(msgpack_path)
+        return self._read_identity(os.path.join(self.keys_dir, f"{filename}.json"))
+    
+    def load_all_identities(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every identity in keys_dir, keyed by identity name
+        Files whose mtime is unchanged since the last call are served from cache.
+        Identities this manager can't unseal (no or wrong passphrase) are returned
+        with the private key still sealed under 'encrypted_private_key'.
+        """
+        paths = {}
+        with os.scandir(self.keys_dir) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if not entry.is_file() or ext not in ('.json', '.msgpack'):
+                    continue
+                # Same precedence as load_identity: .msgpack over .json
+                if ext == '.msgpack' or name not in paths:
+                    paths[name] = (entry.path, entry.stat().st_mtime_ns)
+        
+        cache = {}
+        identities = {}
+        for name, (path, mtime_ns) in paths.items():
+            cached = self._identity_cache.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                identity = cached[1]
+            else:
+                identity = self._read_identity(path, unseal=False)
+                if 'encrypted_private_key' in identity and self._passphrase is not None:
+                    try:
+                        identity = self._open_private_key(dict(identity))
+                    except ValueError:
+                        pass  # Wrong passphrase for this file; keep it sealed
+            cache[path] = (mtime_ns, identity)
+            identities[name] = dict(identity)
+        self._identity_cache = cache
+        return identities
+    
+    def _read_identity(self, filepath: str, unseal: bool = True) -> Dict[str, Any]:
+        """Parse one identity file, unsealing the private key if needed (and asked to)"""
+        if filepath.endswith('.msgpack'):
+            if msgpack is None:
+                # Never fall back to an older .json copy or skip the file: the
+                # .msgpack file is the current identity
+                raise ImportError(f"msgpack is required to read identity file {filepath}")
+            with open(filepath, 'rb') as f:
+                identity = msgpack.unpackb(f.read(), raw=False)
+        else:
+            with open(filepath, 'rb') as f:
+                identity = _loads(f.read())
+        if unseal and 'encrypted_private_key' in identity:
+            identity = self._open_private_key(identity)
+        identity.setdefault('signature_scheme', SIGNATURE_SCHEME_RSA)
+        return identity
+    
+    def _seal_private_key(self, identity: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of identity with the private key PEM encrypted (fingerprint as AAD)"""
+        nonce = secrets.token_bytes(12)
+        key = _derive_storage_key(self._passphrase, self._kdf_salt)
+        ciphertext = ChaCha20Poly1305(key).encrypt(
+            nonce,
+            identity['private_key'].encode('utf-8'),
+            identity['public_key_fingerprint'].encode('utf-8')
+        )
+        sealed = {k: v for k, v in identity.items() if k != 'private_key'}
+        sealed['encrypted_private_key'] = {
+            'cipher': 'chacha20-poly1305',
+            'kdf': 'scrypt',
+            'salt': base64.b64encode(self._kdf_salt).decode('ascii'),
+            'nonce': base64.b64encode(nonce).decode('ascii'),
+            'ciphertext': base64.b64encode(ciphertext).decode('ascii')
+        }
+        return sealed
+    
+    def _open_private_key(self, identity: Dict[str, Any]) -> Dict[str, Any]:
+        """Decrypt a sealed private key back into the identity's 'private_key' PEM"""
+        if self._passphrase is None:
+            raise ValueError("Identity private key is encrypted; a passphrase is required")
+        sealed = identity.pop('encrypted_private_key')
+        key = _derive_storage_key(self._passphrase, base64.b64decode(sealed['salt']))
+        try:
+            private_pem = ChaCha20Poly1305(key).decrypt(
+                base64.b64decode(sealed['nonce']),
+                base64.b64decode(sealed['ciphertext']),
+                identity['public_key_fingerprint'].encode('utf-8')
+            )
+        except InvalidTag:
+            raise ValueError("Could not decrypt identity private key: wrong passphrase or corrupted file")
+        identity['private_key'] = private_pem.decode('utf-8')
         return identity
     
     def _calculate_public_key_fingerprint(self, public_key) -> str:
@@ -75,55 +361,42 @@ class IdentityManager:
             encoding=serialization.Encoding.DER,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
-        fingerprint = hashes.Hash(hashes.SHA256())
-        fingerprint.update(public_key_bytes)
-        return fingerprint.finalize().hex()
+        return hashlib.sha256(public_key_bytes).hexdigest()
     
     def _get_timestamp(self) -> str:
         """Get current timestamp as ISO string"""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + 'Z'
+        return _utc_timestamp()
     
     def sign_message(self, private_key_pem: str, message: str) -> str:
         """Sign a message with the private key"""
-        # Load private key
-        private_key = serialization.load_pem_private_key(
-            private_key_pem.encode('utf-8'),
-            password=None,
-        )
+        # Load private key (parsed once per distinct PEM)
+        private_key = _load_private_key(private_key_pem.encode('utf-8'))
         
         # Sign the message
-        signature = private_key.sign(
-            message.encode('utf-8'),
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        )
+        signature = _sign_message(private_key, message.encode('utf-8'))
         
         # Return signature as hex string
         return signature.hex()
     
+    def sign_file(self, private_key_pem: str, file_path: str) -> str:
+        """
+        Sign the contents of a file with the private key
+        The file is hashed in streaming fashion, so it is never read into memory whole.
+        RSA signatures are the standard SHA-256 PKCS#1 v1.5 signature of the contents.
+        Ed25519 can't sign a stream, so its signature is over the file's raw 32-byte
+        SHA-256 digest: verify it with public_key.verify(signature, sha256(contents).digest()).
+        """
+        private_key = _load_private_key(private_key_pem.encode('utf-8'))
+        return _sign_digest(private_key, _sha256_file_digest(file_path)).hex()
+    
     def verify_signature(self, public_key_pem: str, message: str, signature_hex: str) -> bool:
         """Verify a signature against a message and public key"""
         try:
-            # Load public key
-            public_key = serialization.load_pem_public_key(
-                public_key_pem.encode('utf-8'),
-            )
-            
             # Decode signature from hex
             signature = bytes.fromhex(signature_hex)
             
-            # Verify the signature
-            public_key.verify(
-                signature,
-                message.encode('utf-8'),
-                padding.PKCS1v15(),
-                hashes.SHA256()
-            )
-            
-            return True
-        except InvalidSignature:
-            return False
+            # Verify the signature against the message (key parse and result are cached)
+            return _verify_cached(public_key_pem.encode('utf-8'), message.encode('utf-8'), signature)
         except Exception:
             return False
     
@@ -145,6 +418,16 @@ class IdentityManager:
         """Extract public key from identity dict"""
         return identity['public_key']
     
+    def get_public_key_der_from_identity(self, identity: Dict[str, Any]) -> bytes:
+        """Extract the DER (SubjectPublicKeyInfo) public key from identity dict"""
+        if 'public_key_der_b64' in identity:
+            return base64.b64decode(identity['public_key_der_b64'])
+        # Identities created before the DER was stored
+        return _load_public_key(identity['public_key'].encode('utf-8')).public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    
     def get_private_key_from_identity(self, identity: Dict[str, Any]) -> str:
         """Extract private key from identity dict"""
         return identity['private_key']
@@ -153,17 +436,106 @@ class IdentityManager:
 class CreatorRegistry:
     """Registry to track registered creators and their public keys"""
     
-    def __init__(self, registry_file: str = "data/creators_registry.json"):
+    # Open registries, flushed at interpreter exit. Held weakly so the exit hook
+    # never keeps a dropped registry alive; while changes are pending, the armed
+    # flush timer holds a reference, so nothing is lost to collection.
+    _live: 'weakref.WeakSet[CreatorRegistry]' = weakref.WeakSet()
+    
+    def __init__(self, registry_file: str = "data/creators_registry.json",
+                 flush_threshold: int = 64, flush_delay: float = 1.0):
         self.registry_file = registry_file
         self.registry_dir = os.path.dirname(registry_file)
         os.makedirs(self.registry_dir, exist_ok=True)
         self.creators = self._load_registry()
+        
+        # Secondary indexes: identity name -> fingerprint, short fingerprint prefix -> fingerprints
+        self._by_name: Dict[str, str] = {}
+        self._by_prefix: Dict[str, List[str]] = {}
+        for fingerprint, creator_info in self.creators['creators'].items():
+            self._index_creator(fingerprint, creator_info)
+        
+        # Registrations are written in batches: the file is rewritten once
+        # flush_threshold changes are pending, or flush_delay seconds after the
+        # last change, on flush()/context exit, and at interpreter exit
+        self.flush_threshold = flush_threshold
+        self.flush_delay = flush_delay
+        self._dirty = 0
+        self._timer = None
+        self._flush_at = 0.0
+        self._lock = threading.RLock()
+        CreatorRegistry._live.add(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Flush pending registrations and stop flushing this registry at exit"""
+        self.flush()
+        CreatorRegistry._live.discard(self)
+    
+    @classmethod
+    def _flush_live(cls):
+        """atexit hook: flush every registry that is still open"""
+        for registry in list(cls._live):
+            registry.flush()
+    
+    def flush(self):
+        """Write pending registrations to the registry file"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save_registry()
+                self._dirty = 0
+    
+    def _mark_dirty(self):
+        """Record a pending change and flush now or push back the debounce deadline"""
+        with self._lock:
+            self._dirty += 1
+            if self._dirty >= self.flush_threshold:
+                self.flush()
+                return
+            # One timer per quiet period: later changes only move the deadline,
+            # and the timer re-arms itself for the remainder when it fires early
+            self._flush_at = time.monotonic() + self.flush_delay
+            if self._timer is None:
+                self._arm_timer(self.flush_delay)
+    
+    def _arm_timer(self, delay: float):
+        """Start the debounce timer (caller holds the lock)"""
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _on_timer(self):
+        """Flush once the debounce deadline has passed, otherwise wait out the rest"""
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # Cancelled by a flush while waiting for the lock
+            remaining = self._flush_at - time.monotonic()
+            if remaining > 0:
+                self._arm_timer(remaining)
+                return
+            self._timer = None
+            self.flush()
     
     def _load_registry(self) -> Dict[str, Any]:
         """Load the creator registry from file"""
         if os.path.exists(self.registry_file):
-            with open(self.registry_file, 'r') as f:
-                return json.load(f)
+            with open(self.registry_file, 'rb') as f:
+                # An empty file (e.g. touched but never saved) is a fresh registry
+                if os.fstat(f.fileno()).st_size > 0:
+                    # Parse straight from the mapped pages instead of a bytes copy of the file
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        view = memoryview(mapped)
+                        try:
+                            return _loads(view)
+                        finally:
+                            view.release()
         return {
             'creators': {},
             'version': '1.0',
@@ -173,34 +545,63 @@ class CreatorRegistry:
     def _save_registry(self):
         """Save the creator registry to file"""
         self.creators['last_updated'] = self._get_timestamp()
-        with open(self.registry_file, 'w') as f:
-            json.dump(self.creators, f, indent=2)
+        data = _dumps(self.creators, indent=True)
+        
+        _write_atomic(self.registry_file, data)
     
     def _get_timestamp(self) -> str:
         """Get current timestamp as ISO string"""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + 'Z'
+        return _utc_timestamp()
     
     def register_creator(self, identity_name: str, public_key_fingerprint: str, metadata: Dict[str, Any] = None) -> bool:
-        """Register a new creator in the registry"""
-        if public_key_fingerprint in self.creators['creators']:
-            return False  # Already registered
-        
-        creator_info = {
-            'identity_name': identity_name,
-            'public_key_fingerprint': public_key_fingerprint,
-            'registered_at': self._get_timestamp(),
-            'metadata': metadata or {}
-        }
-        
-        self.creators['creators'][public_key_fingerprint] = creator_info
-        self._save_registry()
+        """Register a new creator in the registry (persisted on the next flush)"""
+        with self._lock:
+            if public_key_fingerprint in self.creators['creators']:
+                return False  # Already registered
+            
+            creator_info = {
+                'identity_name': identity_name,
+                'public_key_fingerprint': public_key_fingerprint,
+                'registered_at': self._get_timestamp(),
+                'metadata': metadata or {}
+            }
+            
+            self.creators['creators'][public_key_fingerprint] = creator_info
+            self._index_creator(public_key_fingerprint, creator_info)
+            self._mark_dirty()
         return True
     
+    def _index_creator(self, public_key_fingerprint: str, creator_info: Dict[str, Any]):
+        """Add a creator to the name and fingerprint-prefix indexes"""
+        self._by_name.setdefault(creator_info['identity_name'], public_key_fingerprint)
+        prefix = public_key_fingerprint[:_FINGERPRINT_PREFIX_LEN].lower()
+        self._by_prefix.setdefault(prefix, []).append(public_key_fingerprint)
+    
     def get_creator_info(self, public_key_fingerprint: str) -> Optional[Dict[str, Any]]:
         """Get information about a registered creator"""
         return self.creators['creators'].get(public_key_fingerprint)
     
+    def find_creator_by_name(self, identity_name: str) -> Optional[Dict[str, Any]]:
+        """Get the creator registered under an identity name (first registration wins)"""
+        fingerprint = self._by_name.get(identity_name)
+        return self.creators['creators'].get(fingerprint) if fingerprint else None
+    
+    def find_creators_by_fingerprint_prefix(self, prefix: str) -> List[Dict[str, Any]]:
+        """
+        Get all creators whose fingerprint starts with prefix (e.g. an 8-hex short ID)
+        Prefixes of at least 8 characters are an index lookup; shorter ones scan the index keys
+        """
+        prefix = prefix.lower()
+        if len(prefix) >= _FINGERPRINT_PREFIX_LEN:
+            candidates = self._by_prefix.get(prefix[:_FINGERPRINT_PREFIX_LEN], [])
+        else:
+            candidates = [fingerprint
+                          for short_id, fingerprints in self._by_prefix.items() if short_id.startswith(prefix)
+                          for fingerprint in fingerprints]
+        creators = self.creators['creators']
+        return [creators[fingerprint] for fingerprint in candidates
+                if fingerprint.lower().startswith(prefix)]
+    
     def verify_creator_ownership(self, public_key_fingerprint: str, challenge: str, signature: str) -> bool:
         """Verify that a creator owns their public key by signing a challenge"""
         # In a real system, we'd need the public key to verify
@@ -218,6 +619,9 @@ class CreatorRegistry:
         return self.creators['creators'].copy()
 
 
+atexit.register(CreatorRegistry._flush_live)
+
+
 # Example usage
 if __name__ == "__main__":
     # Initialize the identity manager
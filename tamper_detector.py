@@ -4,51 +4,212 @@ Detects various forms of digital manipulation in images and videos
 """
 import numpy as np
 import cv2
-from PIL import Image
 from scipy import ndimage
-from typing import Dict, Any, Tuple, List
+from scipy.fft import dct
+from typing import Dict, Any, Tuple, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from numpy.lib.stride_tricks import sliding_window_view
 import os
+import threading
+from config.config import FACE_DETECTION_MODEL
 from utils.helpers import extract_metadata
+from utils.parallel import run_detectors
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _pair_ncc(blocks, ys, xs, block_size, threshold):
+        """
+        Match pairs of raw uint8 blocks whose correlation exceeds threshold, without
+        an n x n matrix or a float copy of the blocks. Sums, squared sums and dot
+        products are exact integers (at most 1024 * 255^2 per block, so uint32 is
+        enough); the Pearson shortcut r = (k*dot - s1*s2) / sqrt((k*sq1 - s1^2)(k*sq2 - s2^2))
+        avoids re-centering every pair. Blocks must not be flat; overlapping pairs
+        (blocks at (ys, xs) less than block_size apart on both axes) are skipped.
+        Returns (matching pairs, summed correlation, blocks with a match).
+        """
+        n, k = blocks.shape
+        sums = np.empty(n, np.float64)
+        spreads = np.empty(n, np.float64)
+        for i in prange(n):
+            s = np.uint32(0)
+            sq = np.uint32(0)
+            for t in range(k):
+                v = np.uint32(blocks[i, t])
+                s += v
+                sq += v * v
+            sums[i] = s
+            spreads[i] = np.sqrt(np.float64(k) * sq - np.float64(s) * s)
+        
+        counts = np.zeros(n, np.int64)
+        scores = np.zeros(n, np.float64)
+        matched = np.zeros(n, np.bool_)  # Racy writes are all True, so any order is fine
+        for i in prange(n):
+            for j in range(i + 1, n):
+                if abs(ys[i] - ys[j]) < block_size and abs(xs[i] - xs[j]) < block_size:
+                    continue
+                dot = np.uint32(0)
+                for t in range(k):
+                    dot += np.uint32(blocks[i, t]) * np.uint32(blocks[j, t])
+                r = (np.float64(k) * dot - sums[i] * sums[j]) / (spreads[i] * spreads[j])
+                if r > threshold:
+                    counts[i] += 1
+                    scores[i] += r
+                    matched[i] = True
+                    matched[j] = True
+        return counts.sum(), scores.sum(), matched.sum()
+
+
+# Orthonormal 8x8 DCT-II basis (same transform as cv2.dct) and its transpose, kept
+# C-contiguous so the block transforms go straight to BLAS
+_D8 = np.ascontiguousarray(dct(np.eye(8), norm='ortho', axis=0), dtype=np.float32)
+_D8_T = np.ascontiguousarray(_D8.T)
+
+# Lowest 8 rows of the 32-point DCT basis, for perceptual hashes of 32x32 blocks
+_D32_LOW = np.ascontiguousarray(dct(np.eye(32), norm='ortho', axis=0)[:8], dtype=np.float32)
+
+
+# Loaded face detectors not currently in use, shared by every thread in the process.
+# Both the Haar cascade and YuNet keep per-image state, so each one is lent to a
+# single caller at a time and returned afterwards; a detector is only ever loaded
+# when all existing ones are busy.
+_idle_detectors: Dict[str, List[Any]] = {'haar': [], 'dnn': []}
+_idle_detectors_lock = threading.Lock()
+
+
+@contextmanager
+def _lend_detector(kind: str, load):
+    """Borrow an idle detector of this kind, loading a new one if none is free"""
+    with _idle_detectors_lock:
+        idle = _idle_detectors[kind]
+        detector = idle.pop() if idle else None
+    if detector is None:
+        detector = load()
+    try:
+        yield detector
+    finally:
+        with _idle_detectors_lock:
+            _idle_detectors[kind].append(detector)
+
+
+def _load_face_cascade():
+    """Parse the frontal-face Haar cascade XML"""
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def _load_face_dnn():
+    """Load the YuNet face detector model"""
+    return cv2.FaceDetectorYN.create(str(FACE_DETECTION_MODEL), "", (0, 0), 0.6, 0.3, 5000)
+
+
+def _face_dnn_available() -> bool:
+    """Whether this OpenCV build has YuNet and its model file is present"""
+    return hasattr(cv2, 'FaceDetectorYN') and os.path.exists(FACE_DETECTION_MODEL)
+
+
+def _detect_faces(img: Optional[np.ndarray], gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """
+    Find face boxes as (x, y, w, h), preferring the YuNet DNN detector over Haar
+    """
+    if not _face_dnn_available():
+        with _lend_detector('haar', _load_face_cascade) as cascade:
+            faces = cascade.detectMultiScale(gray, 1.1, 4)
+        return [tuple(int(v) for v in face) for face in faces]
+    
+    # YuNet expects a 3-channel image and may return boxes reaching past the border
+    bgr = img if img is not None else cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+    height, width = gray.shape
+    with _lend_detector('dnn', _load_face_dnn) as detector:
+        detector.setInputSize((width, height))
+        _, detections = detector.detect(bgr)
+    
+    faces = []
+    for x, y, w, h in (detections[:, :4] if detections is not None else []):
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(width, int(x + w)), min(height, int(y + h))
+        if x1 > x0 and y1 > y0:
+            faces.append((x0, y0, x1 - x0, y1 - y0))
+    return faces
+
+
+def _grid_variances(img: np.ndarray, block_size: int,
+                    stride: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top-left corners (ys, xs) and pixel variances of the block grid, in row-major
+    order, from integral images without touching the pixels again
+    """
+    height, width = img.shape
+    sums, sqsums = cv2.integral2(img, sdepth=cv2.CV_64F)
+    ys, xs = np.meshgrid(np.arange(0, height - block_size, stride),
+                         np.arange(0, width - block_size, stride), indexing='ij')
+    ys, xs = ys.ravel(), xs.ravel()
+    
+    def box(table):
+        return (table[ys + block_size, xs + block_size] - table[ys, xs + block_size]
+                - table[ys + block_size, xs] + table[ys, xs])
+    
+    area = block_size * block_size
+    return ys, xs, box(sqsums) / area - (box(sums) / area) ** 2
+
+
+# Blocks at or below this pixel variance (flat areas, gentle gradients) correlate
+# with each other trivially, so copy-move search only compares textured blocks
+_TEXTURE_MIN_VARIANCE = 25.0
+
+# Copy-move search strategies: 'blocks' (all-pairs GEMM, the default), 'template'
+# (textured reference blocks matched over the frame), 'pairs' (low-memory Numba) or
+# 'phash'. All of them score the share of searched blocks that have a clone.
+CLONING_METHODS = ('blocks', 'template', 'pairs', 'phash')
 
 
 class TamperDetector:
     """Detection engine for various forms of digital tampering"""
     
-    def __init__(self):
+    def __init__(self, cloning_method: str = 'blocks', max_workers: Optional[int] = None):
+        if cloning_method not in CLONING_METHODS:
+            raise ValueError(f"Unsupported cloning method: {cloning_method}")
+        if cloning_method == 'pairs' and not NUMBA_AVAILABLE:
+            # Without the kernel 'pairs' would mean the n x n GEMM it exists to avoid
+            raise ValueError("The 'pairs' cloning method requires numba")
         self.ela_threshold = 20  # Error Level Analysis threshold
         self.sensitivity = 0.7   # General sensitivity for tampering detection
+        self.cloning_method = cloning_method  # One of CLONING_METHODS
+        self.max_template_references = 32  # Reference blocks searched by the 'template' method
+        self.max_workers = max_workers  # Threads for detect_manipulation (None = one per CPU)
     
-    def error_level_analysis(self, image_path: str, quality: int = 95) -> Tuple[float, Dict[str, Any]]:
+    def error_level_analysis(self, image_path: str, quality: int = 95, *,
+                             img: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Perform Error Level Analysis to detect re-compression artifacts
         """
         try:
-            # Load the image
-            img = Image.open(image_path)
-            
-            # Save the image at a different quality and reload
-            temp_path = image_path + "_temp.jpg"
-            img.save(temp_path, 'JPEG', quality=quality)
-            temp_img = Image.open(temp_path)
-            
-            # Calculate the difference between original and recompressed
-            original_array = np.array(img)
-            temp_array = np.array(temp_img)
+            # Load the image as 3-channel BGR (alpha and palettes are flattened)
+            original_array = img if img is not None else cv2.imread(image_path, cv2.IMREAD_COLOR)
+            if original_array is None:
+                return 0.0, {"error": "Could not load image"}
             
-            # Ensure arrays have the same shape
-            if original_array.shape != temp_array.shape:
-                # Resize temp_array to match original if needed
-                temp_array = np.array(temp_img.resize(img.size, resample=Image.Resampling.LANCZOS))
-                if len(original_array.shape) == 3 and len(temp_array.shape) == 3:
-                    temp_array = temp_array[:,:,:3]  # Handle RGBA vs RGB
+            # Re-compress at a different quality in memory and decode it again
+            ok, encoded = cv2.imencode('.jpg', original_array, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+            if not ok:
+                return 0.0, {"error": "Error in ELA: JPEG encoding failed"}
+            temp_array = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
             
-            # Calculate error level
-            ela_map = np.abs(original_array.astype(np.int16) - temp_array.astype(np.int16))
+            # Calculate error level (saturating uint8 abs-diff, no int16 copies)
+            ela_map = cv2.absdiff(original_array, temp_array)
             
-            # Calculate statistics
-            mean_error = np.mean(ela_map)
-            std_error = np.std(ela_map)
-            max_error = np.max(ela_map)
+            # Calculate statistics over all pixels and channels at once
+            mean, std = cv2.meanStdDev(ela_map.reshape(-1, 1))
+            mean_error = mean[0, 0]
+            std_error = std[0, 0]
+            max_error = ela_map.max()
             
             # High variance in error levels might indicate manipulation
             if std_error > self.ela_threshold:
@@ -60,10 +221,6 @@ class TamperDetector:
                 tampered = False
                 explanation = "Consistent error levels suggest original content"
             
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            
             details = {
                 "mean_error": float(mean_error),
                 "std_error": float(std_error),
@@ -77,11 +234,12 @@ class TamperDetector:
         except Exception as e:
             return 0.0, {"error": f"Error in ELA: {str(e)}"}
     
-    def detect_cloning_tampering(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_cloning_tampering(self, image_path: str, *,
+                                 gray: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect copy-move forgery using block matching
         """
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        img = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         if img is None:
             return 0.0, {"error": "Could not load image"}
         
@@ -92,67 +250,134 @@ class TamperDetector:
             new_height = int(img.shape[0] * scale_factor)
             img = cv2.resize(img, (new_width, new_height))
         
+        if self.cloning_method == 'template':
+            return self._detect_cloning_by_template(img)
+        
         # Divide image into overlapping blocks
         block_size = 32
         stride = 16
         
-        blocks = []
-        positions = []
+        height, width = img.shape
+        if height <= block_size or width <= block_size:
+            return 0.0, {"error": "Image too small for cloning detection"}
+        
+        # Zero-copy (rows, cols, 32, 32) view of the block grid
+        windows = sliding_window_view(img, (block_size, block_size))
+        windows = windows[:height - block_size:stride, :width - block_size:stride]
+        if windows.shape[0] * windows.shape[1] < 2:
+            return 0.0, {"error": "Image too small for cloning detection"}
+        
+        # Only textured blocks are compared, flattened in one copy
+        ys, xs, variances = _grid_variances(img, block_size, stride)
+        textured = np.flatnonzero(variances > _TEXTURE_MIN_VARIANCE)
+        pixels = windows.reshape(-1, block_size * block_size)[textured]
+        ys, xs = ys[textured], xs[textured]
+        
+        num_blocks = len(pixels)
+        total_comparisons = num_blocks * (num_blocks - 1) // 2
+        if num_blocks < 2:
+            return self._cloning_result(num_blocks, 0, 0, total_comparisons, 0.0)
+        
+        if self.cloning_method == 'pairs':
+            # Compiled pair loop on the uint8 pixels: constant memory instead of n x n
+            similar_pairs, tamper_score, matched_blocks = _pair_ncc(pixels, ys, xs, block_size, 0.9)
+            return self._cloning_result(num_blocks, int(matched_blocks), int(similar_pairs),
+                                        total_comparisons, float(tamper_score))
+        
+        blocks = pixels.astype(np.float32)
+        
+        if self.cloning_method == 'phash':
+            return self._detect_cloning_by_hash(blocks, np.stack([ys, xs], axis=1), block_size)
+        
+        # Normalize every block once: zero mean, unit std, then unit length
+        blocks -= blocks.mean(axis=1, keepdims=True)
+        blocks /= blocks.std(axis=1, keepdims=True) + 1e-6
+        norms = np.sqrt(np.einsum('ij,ij->i', blocks, blocks))
+        blocks /= np.maximum(norms, 1e-6)[:, None]
+        
+        # Normalized cross-correlation of all block pairs in a single GEMM
+        correlations = np.triu(blocks @ blocks.T, 1)
+        first, second = np.nonzero(correlations > 0.9)  # High correlation suggests duplication
+        
+        # Ignore neighbours that overlap each other
+        apart = ((np.abs(ys[first] - ys[second]) >= block_size)
+                 | (np.abs(xs[first] - xs[second]) >= block_size))
+        first, second = first[apart], second[apart]
+        matched_blocks = len(np.union1d(first, second))
+        tamper_score = float(correlations[first, second].sum())
+        
+        return self._cloning_result(num_blocks, matched_blocks, len(first), total_comparisons, tamper_score)
+    
+    def _cloning_result(self, num_blocks: int, matched_blocks: int, similar_pairs: int,
+                        total_comparisons: int, tamper_score: float) -> Tuple[float, Dict[str, Any]]:
+        """
+        Turn block matching counts into a confidence and details; the confidence is
+        the share of analyzed blocks with a clone elsewhere in the image
+        """
+        if num_blocks > 0:
+            avg_correlation = tamper_score / max(similar_pairs, 1)
+            confidence = min(1.0, (matched_blocks / num_blocks) * 3.0)
+        else:
+            confidence = 0.0
+            avg_correlation = 0.0
+        
+        details = {
+            "total_blocks_analyzed": num_blocks,
+            "similar_pairs_found": similar_pairs,
+            "total_comparisons": total_comparisons,
+            "average_correlation": float(avg_correlation),
+            "cloning_analysis": "Potential cloning detected" if similar_pairs > 5 else "No significant cloning patterns found"
+        }
         
-        for i in range(0, img.shape[0] - block_size, stride):
-            for j in range(0, img.shape[1] - block_size, stride):
-                block = img[i:i+block_size, j:j+block_size]
-                if block.shape == (block_size, block_size):
-                    blocks.append(block.flatten())
-                    positions.append((i, j))
+        return confidence, details
+    
+    def _detect_cloning_by_template(self, img: np.ndarray) -> Tuple[float, Dict[str, Any]]:
+        """
+        Detect copy-move forgery by searching the image for its most textured blocks
+        """
+        block_size = 32
+        stride = 16
+        height, width = img.shape
         
-        if len(blocks) < 2:
+        if height <= block_size or width <= block_size:
             return 0.0, {"error": "Image too small for cloning detection"}
         
-        blocks = np.array(blocks)
+        ys, xs, variances = _grid_variances(img, block_size, stride)
         
-        # Calculate correlations between blocks
-        tamper_score = 0
-        similar_pairs = 0
-        total_comparisons = 0
-        
-        # Limit comparisons for performance
-        max_comparisons = 1000
-        for i in range(min(len(blocks), 100)):  # Only check first 100 blocks
-            for j in range(i + 1, min(len(blocks), i + 50)):  # Check next 50 blocks
-                if total_comparisons >= max_comparisons:
-                    break
-                
-                # Calculate normalized cross-correlation
-                block1 = blocks[i].astype(np.float64)
-                block2 = blocks[j].astype(np.float64)
-                
-                # Normalize blocks
-                block1_norm = (block1 - np.mean(block1)) / (np.std(block1) + 1e-6)
-                block2_norm = (block2 - np.mean(block2)) / (np.std(block2) + 1e-6)
-                
-                correlation = np.sum(block1_norm * block2_norm) / np.sqrt(
-                    np.sum(block1_norm**2) * np.sum(block2_norm**2) + 1e-6
-                )
-                
-                if correlation > 0.9:  # High correlation suggests duplication
-                    similar_pairs += 1
-                    tamper_score += correlation
-                
-                total_comparisons += 1
-            
-            if total_comparisons >= max_comparisons:
-                break
+        # Flat blocks match everything; search with the most distinctive ones
+        order = np.argsort(variances)[::-1][:self.max_template_references]
+        order = order[variances[order] > _TEXTURE_MIN_VARIANCE]
         
+        similar_pairs = 0
+        matched_blocks = 0
+        tamper_score = 0.0
+        
+        for idx in order:
+            y, x = int(ys[idx]), int(xs[idx])
+            template = img[y:y+block_size, x:x+block_size]
+            response = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED)
+            
+            # Ignore the block itself and offsets overlapping it
+            response[max(0, y - block_size + 1):y + block_size,
+                     max(0, x - block_size + 1):x + block_size] = 0
+            
+            mask = (response > 0.9).astype(np.uint8)  # High correlation suggests duplication
+            regions = cv2.connectedComponents(mask)[0] - 1
+            if regions > 0:
+                similar_pairs += regions
+                matched_blocks += 1
+                tamper_score += float(response.max())
+        
+        total_comparisons = len(order)
         if total_comparisons > 0:
-            avg_correlation = tamper_score / max(similar_pairs, 1)
-            confidence = min(1.0, (similar_pairs / total_comparisons) * 3.0)
+            avg_correlation = tamper_score / max(matched_blocks, 1)
+            confidence = min(1.0, (matched_blocks / total_comparisons) * 3.0)
         else:
             confidence = 0.0
             avg_correlation = 0.0
         
         details = {
-            "total_blocks_analyzed": min(len(blocks), 100),
+            "total_blocks_analyzed": total_comparisons,
             "similar_pairs_found": similar_pairs,
             "total_comparisons": total_comparisons,
             "average_correlation": float(avg_correlation),
@@ -161,43 +386,105 @@ class TamperDetector:
         
         return confidence, details
     
-    def detect_face_swaps(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def _detect_cloning_by_hash(self, blocks: np.ndarray, positions: np.ndarray,
+                                block_size: int) -> Tuple[float, Dict[str, Any]]:
+        """
+        Detect copy-move forgery by bucketing textured blocks on a 64-bit perceptual hash
+        """
+        similar_pairs = 0
+        tamper_score = 0.0
+        matched = np.zeros(len(blocks), dtype=bool)
+        
+        if len(blocks) >= 2:
+            # pHash: signs of the 8x8 lowest-frequency DCT coefficients against their median
+            low = _D32_LOW @ blocks.reshape(-1, block_size, block_size) @ _D32_LOW.T
+            low = low.reshape(len(blocks), 64)
+            bits = low > np.median(low, axis=1, keepdims=True)
+            hashes = np.packbits(bits, axis=1).view('>u8').ravel()
+            
+            # Blocks sharing a hash are candidate clones; group them by bucket
+            _, bucket, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+            candidates = np.flatnonzero(counts[bucket] > 1)
+            candidates = candidates[np.argsort(bucket[candidates], kind='stable')]
+            groups = np.split(candidates, np.flatnonzero(np.diff(bucket[candidates])) + 1)
+            
+            for group in groups:
+                if len(group) < 2:
+                    continue
+                first, second = np.triu_indices(len(group), 1)
+                a, b = group[first], group[second]
+                
+                # Ignore neighbours that overlap each other
+                offsets = np.abs(positions[a] - positions[b])
+                apart = (offsets >= block_size).any(axis=1)
+                a, b = a[apart], b[apart]
+                if len(a) == 0:
+                    continue
+                
+                # Confirm with the normalized cross-correlation used by the other methods
+                za = blocks[a] - blocks[a].mean(axis=1, keepdims=True)
+                zb = blocks[b] - blocks[b].mean(axis=1, keepdims=True)
+                correlation = np.einsum('ij,ij->i', za, zb) / np.maximum(
+                    np.linalg.norm(za, axis=1) * np.linalg.norm(zb, axis=1), 1e-6)
+                
+                confirmed = correlation > 0.9  # High correlation suggests duplication
+                similar_pairs += int(np.count_nonzero(confirmed))
+                tamper_score += float(correlation[confirmed].sum())
+                matched[a[confirmed]] = True
+                matched[b[confirmed]] = True
+        
+        total_blocks = len(blocks)
+        return self._cloning_result(total_blocks, int(np.count_nonzero(matched)), similar_pairs,
+                                    total_blocks, tamper_score)
+    
+    def detect_face_swaps(self, image_path: str, *,
+                          img: Optional[np.ndarray] = None,
+                          gray: Optional[np.ndarray] = None,
+                          scale: float = 1.0) -> Tuple[float, Dict[str, Any]]:
         """
         Detect potential face swaps using facial landmark analysis
+        `scale` is the factor the given arrays were resized by; positions are
+        reported in original image pixels
         """
         # Load image
-        img = cv2.imread(image_path)
-        if img is None:
-            return 0.0, {"error": "Could not load image"}
-        
-        # Use OpenCV's Haar cascades for face detection
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        if gray is None:
+            if img is None:
+                img = cv2.imread(image_path)
+            if img is None:
+                return 0.0, {"error": "Could not load image"}
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+        # Use the YuNet face detector when its model is installed, else Haar
+        faces = _detect_faces(img, gray)
         
         face_analysis_results = []
         total_confidence = 0.0
         
+        if len(faces) > 0:
+            # Detect edges once over the whole frame; an integral image then gives the
+            # edge count of any rectangle in constant time
+            edge_counts = cv2.integral((cv2.Canny(gray, 50, 150) > 0).view(np.uint8))
+        
+        def edge_density(x0, y0, x1, y1):
+            area = (x1 - x0) * (y1 - y0)
+            if area <= 0:
+                return 0.0
+            count = (edge_counts[y1, x1] - edge_counts[y0, x1]
+                     - edge_counts[y1, x0] + edge_counts[y0, x0])
+            return count / area
+        
+        height, width = gray.shape
         for (x, y, w, h) in faces:
-            face_region = gray[y:y+h, x:x+w]
-            
             # Check for inconsistencies in lighting, texture, etc.
             # Analyze edges within the face region
-            edges = cv2.Canny(face_region, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
+            x1, y1 = min(x + w, width), min(y + h, height)
+            face_edge_density = edge_density(x, y, x1, y1)
             
-            # Check for unnatural boundaries
-            face_boundary = gray[max(0, y-5):y, x:x+w] if y > 5 else np.array([])
-            if face_boundary.size > 0:
-                boundary_edges = cv2.Canny(face_boundary, 50, 150)
-                boundary_edge_density = np.sum(boundary_edges > 0) / boundary_edges.size
-            else:
-                boundary_edge_density = 0
+            # Check for unnatural boundaries in the strip just above the face
+            boundary_edge_density = edge_density(x, y - 5, x1, y) if y > 5 else 0
             
             # Compare edge densities - significant differences may indicate tampering
-            if abs(edge_density - boundary_edge_density) > 0.1:
+            if abs(face_edge_density - boundary_edge_density) > 0.1:
                 face_confidence = 0.7
                 analysis = "Edge density mismatch at face boundary"
             else:
@@ -206,8 +493,8 @@ class TamperDetector:
             
             total_confidence += face_confidence
             face_analysis_results.append({
-                "position": (int(x), int(y), int(w), int(h)),
-                "edge_density": float(edge_density),
+                "position": tuple(int(round(v / scale)) for v in (x, y, w, h)),
+                "edge_density": float(face_edge_density),
                 "boundary_edge_density": float(boundary_edge_density),
                 "confidence": face_confidence,
                 "analysis": analysis
@@ -228,46 +515,42 @@ class TamperDetector:
         
         return avg_confidence, details
     
-    def detect_splicing_tampering(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_splicing_tampering(self, image_path: str, *,
+                                  lab: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect image splicing using noise pattern analysis
         """
-        img = cv2.imread(image_path)
-        if img is None:
-            return 0.0, {"error": "Could not load image"}
-        
-        # Convert to different color spaces and analyze noise patterns
-        lab_img = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-        yuv_img = cv2.cvtColor(img, cv2.COLOR_BGR2YUV)
-        
-        # Analyze noise in different channels
+        # Convert to LAB and analyze noise patterns
+        if lab is None:
+            img = cv2.imread(image_path)
+            if img is None:
+                return 0.0, {"error": "Could not load image"}
+            lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+        lab_img = lab
+        
+        # Non-overlapping patch grid, shared by all channels
+        patch_size = 32
+        area = patch_size * patch_size
+        height, width = lab_img.shape[:2]
+        ii, jj = np.meshgrid(np.arange(0, height - patch_size, patch_size),
+                             np.arange(0, width - patch_size, patch_size), indexing='ij')
+        
+        # Patch sums and squared sums for all three channels from one integral pass
+        # (exact for uint8); results have shape (rows, cols, 3)
+        sums, sqsums = cv2.integral2(lab_img, sdepth=cv2.CV_64F)
+        patch_sums = (sums[ii + patch_size, jj + patch_size] - sums[ii, jj + patch_size]
+                      - sums[ii + patch_size, jj] + sums[ii, jj])
+        patch_sqsums = (sqsums[ii + patch_size, jj + patch_size] - sqsums[ii, jj + patch_size]
+                        - sqsums[ii + patch_size, jj] + sqsums[ii, jj])
+        patch_variances = patch_sqsums / area - (patch_sums / area) ** 2
+        
+        # Analyze noise in each channel; high variance in patch variances may
+        # indicate different sources
         noise_scores = []
-        
-        for channel_idx in range(3):  # Process each channel
-            channel = lab_img[:,:,channel_idx].astype(np.float32)
-            
-            # Apply Laplacian to detect edges and textures
-            laplacian = cv2.Laplacian(channel, cv2.CV_64F)
-            
-            # Calculate local statistics in patches
-            patch_size = 32
-            height, width = channel.shape
-            
-            patch_variances = []
-            for i in range(0, height - patch_size, patch_size):
-                for j in range(0, width - patch_size, patch_size):
-                    patch = channel[i:i+patch_size, j:j+patch_size]
-                    patch_var = np.var(patch)
-                    patch_variances.append(patch_var)
-            
-            if patch_variances:
-                var_std = np.std(patch_variances)
-                var_mean = np.mean(patch_variances)
-                
-                # High variance in patch variances may indicate different sources
-                if var_mean > 0:
-                    noise_inconsistency = var_std / var_mean
-                    noise_scores.append(noise_inconsistency)
+        if ii.size:
+            var_std = patch_variances.std(axis=(0, 1))
+            var_mean = patch_variances.mean(axis=(0, 1))
+            noise_scores = list(var_std[var_mean > 0] / var_mean[var_mean > 0])
         
         if noise_scores:
             avg_inconsistency = np.mean(noise_scores)
@@ -285,37 +568,39 @@ class TamperDetector:
         
         return confidence, details
     
-    def detect_re_encoding_inconsistencies(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_re_encoding_inconsistencies(self, image_path: str, *,
+                                           gray: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Detect inconsistencies caused by multiple encodings
         """
-        img = cv2.imread(image_path)
-        if img is None:
+        # Luma only: decoding straight to grayscale skips chroma upsampling and
+        # the BGR -> YUV conversion
+        y_channel = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if y_channel is None:
             return 0.0, {"error": "Could not load image"}
         
         # Analyze JPEG quantization tables indirectly through DCT analysis
         # This is a simplified version - real implementation would need access to quantization tables
         
-        # Convert to YUV and analyze the Y channel
-        yuv_img = cv2.cvtColor(img, cv2.COLOR_BGR2YUV)
-        y_channel = yuv_img[:,:,0]
-        
-        # Perform 8x8 block DCT analysis
+        # Perform 8x8 block DCT analysis on the block grid starting at the origin
+        # (the last row/column of blocks is skipped, as before)
         height, width = y_channel.shape
-        dct_blocks = []
+        rows, cols = (height - 1) // 8, (width - 1) // 8
         
-        for i in range(0, height - 8, 8):
-            for j in range(0, width - 8, 8):
-                block = y_channel[i:i+8, j:j+8].astype(np.float32)
-                dct_block = cv2.dct(block)
-                dct_blocks.append(dct_block)
-        
-        if not dct_blocks:
+        if rows < 1 or cols < 1:
             return 0.0, {"error": "Image too small for DCT analysis"}
         
+        # D @ X @ D.T for every block without stacking them: one GEMM multiplies each
+        # 8-pixel row segment by D.T in place, then D is applied to each 8-row strip.
+        # Coefficients come out ordered (strip, k, block column, l); the statistics
+        # below ignore order, and the first value is still block (0, 0)'s DC term.
+        plane = y_channel[:rows * 8, :cols * 8].astype(np.float32)
+        row_passed = (plane.reshape(-1, 8) @ _D8_T).reshape(rows, 8, cols * 8)
+        dct_coeffs = np.matmul(_D8, row_passed)
+        
         # Analyze the distribution of DCT coefficients
         # Natural images have different DCT characteristics than re-encoded images
-        all_coeffs = np.concatenate([block.flatten() for block in dct_blocks])
+        all_coeffs = dct_coeffs.ravel()
         
         # Look for patterns typical of JPEG compression
         # Quantization creates specific patterns in DCT domain
@@ -329,9 +614,16 @@ class TamperDetector:
         # Very low entropy might indicate heavy quantization/re-encoding
         normalized_entropy = entropy / np.log2(len(coeff_histogram))
         
-        # Analyze AC coefficient distribution (should follow certain patterns in natural images)
-        ac_coeffs = all_coeffs[all_coeffs != all_coeffs[0]]  # Exclude DC coefficients
-        ac_kurtosis = np.mean(((ac_coeffs - np.mean(ac_coeffs)) / (np.std(ac_coeffs) + 1e-6))**4) - 3
+        # Analyze AC coefficient distribution (should follow certain patterns in natural images).
+        # Coefficients equal to the first DC value are masked out rather than copied out;
+        # moments use one standardized temporary, squared in place, with float64 sums.
+        ac_mask = all_coeffs != all_coeffs[0]  # Exclude DC coefficients
+        ac_mean = all_coeffs.mean(dtype=np.float64, where=ac_mask)
+        ac_std = all_coeffs.std(dtype=np.float64, where=ac_mask)
+        standardized = (all_coeffs - np.float32(ac_mean)) / np.float32(ac_std + 1e-6)
+        np.square(standardized, out=standardized)
+        np.square(standardized, out=standardized)
+        ac_kurtosis = standardized.mean(dtype=np.float64, where=ac_mask) - 3
         
         # Extreme kurtosis values may indicate re-encoding
         kurtosis_deviation = abs(ac_kurtosis)
@@ -353,13 +645,15 @@ class TamperDetector:
         
         return confidence, details
     
-    def detect_metadata_visual_mismatch(self, image_path: str) -> Tuple[float, Dict[str, Any]]:
+    def detect_metadata_visual_mismatch(self, image_path: str, *,
+                                        img: Optional[np.ndarray] = None) -> Tuple[float, Dict[str, Any]]:
         """
         Check for mismatches between metadata and visual content
         """
         try:
             metadata = extract_metadata(image_path)
-            img = cv2.imread(image_path)
+            if img is None:
+                img = cv2.imread(image_path)
             
             if img is None:
                 return 0.0, {"error": "Could not load image"}
@@ -417,13 +711,39 @@ class TamperDetector:
         if content_type == 'image':
             image_path = content_data['file_path']
             
+            # Decode once and share the arrays (and color conversions) with every detector
+            img = cv2.imread(image_path)
+            gray = small = small_gray = lab = None
+            scale = 1.0
+            if img is not None:
+                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+                
+                # Cloning, face and splicing analysis look at image structure rather than
+                # compression artifacts, so they share one copy capped at 1000px (the
+                # size cloning detection already worked at); ELA, re-encoding and
+                # metadata checks keep full resolution
+                scale = min(1.0, 1000.0 / max(img.shape[:2]))
+                if scale < 1.0:
+                    size = (int(img.shape[1] * scale), int(img.shape[0] * scale))
+                    small = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+                    small_gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+                else:
+                    small, small_gray = img, gray
+                lab = cv2.cvtColor(small, cv2.COLOR_BGR2LAB)
+            
             # Run all detection methods
-            ela_conf, ela_details = self.error_level_analysis(image_path)
-            clone_conf, clone_details = self.detect_cloning_tampering(image_path)
-            face_conf, face_details = self.detect_face_swaps(image_path)
-            splice_conf, splice_details = self.detect_splicing_tampering(image_path)
-            reenc_conf, reenc_details = self.detect_re_encoding_inconsistencies(image_path)
-            meta_conf, meta_details = self.detect_metadata_visual_mismatch(image_path)
+            detectors = [
+                (self.error_level_analysis, {'img': img}),
+                (self.detect_cloning_tampering, {'gray': small_gray}),
+                (self.detect_face_swaps, {'img': small, 'gray': small_gray, 'scale': scale}),
+                (self.detect_splicing_tampering, {'lab': lab}),
+                (self.detect_re_encoding_inconsistencies, {'gray': gray}),
+                (self.detect_metadata_visual_mismatch, {'img': img})
+            ]
+            outputs = run_detectors(image_path, detectors, self.max_workers)
+            (ela_conf, ela_details), (clone_conf, clone_details), (face_conf, face_details), \
+                (splice_conf, splice_details), (reenc_conf, reenc_details), \
+                (meta_conf, meta_details) = outputs
             
             # Store individual results
             results['manipulation_signals'] = {
@@ -479,6 +799,36 @@ class TamperDetector:
             results['error'] = f"Unsupported content type: {content_type}"
         
         return results
+    
+    @classmethod
+    def batch(cls, items: List[Union[str, Dict[str, Any]]], workers: Optional[int] = None,
+              cloning_method: str = 'blocks') -> List[Dict[str, Any]]:
+        """
+        Run detect_manipulation over many images (paths or content dicts) across
+        worker processes, returning results in input order
+        """
+        contents = [{'content_type': 'image', 'file_path': item} if isinstance(item, str) else item
+                    for item in items]
+        workers = min(len(contents), workers or os.cpu_count() or 1)
+        if workers <= 1:
+            detector = cls(cloning_method=cloning_method)
+            return [detector.detect_manipulation(content) for content in contents]
+        
+        chunksize = max(1, min(4, len(contents) // workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(partial(_detect_in_worker, cls, cloning_method), contents,
+                                 chunksize=chunksize))
+
+
+@lru_cache(maxsize=None)
+def _worker_detector(cls, cloning_method: str) -> TamperDetector:
+    """Build this worker process's detector once; parallelism comes from the processes"""
+    cv2.setNumThreads(1)
+    return cls(cloning_method=cloning_method, max_workers=1)
+
+
+def _detect_in_worker(cls, cloning_method: str, content: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_detector(cls, cloning_method).detect_manipulation(content)
 
 
 # Example usage
@@ -0,0 +1,21 @@
+"""
+Concurrency helpers shared by the detection engines
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def run_detectors(image_path: str, detectors: List[Tuple[Callable, Dict[str, Any]]],
+                  max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Call each detector as fn(image_path, **arrays) and return the outputs in order.
+    Detectors are independent and spend their time in NumPy/OpenCV kernels that
+    release the GIL, so they run on a thread pool when there are cores to spare.
+    """
+    workers = min(len(detectors), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [fn(image_path, **arrays) for fn, arrays in detectors]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fn, image_path, **arrays) for fn, arrays in detectors]
+        return [future.result() for future in futures]